@@ -0,0 +1,29 @@
+import os
+
+LOCMEM_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', LOCMEM_BACKEND),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
+}
+
+# LocMemCache lives in a single process: invalidations never reach other
+# workers, so its entries are kept short. Use a shared backend (memcached,
+# database) when running several workers.
+if CACHES['default']['BACKEND'] == LOCMEM_BACKEND:
+    CACHES['default']['OPTIONS'] = {
+        'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 10000)),
+    }
+    FILMWORK_CACHE_DEFAULT_TIMEOUT = 60
+else:
+    FILMWORK_CACHE_DEFAULT_TIMEOUT = 3600
+
+CATALOG_STATS_CACHE_TIMEOUT = int(
+    os.environ.get('CATALOG_STATS_CACHE_TIMEOUT', 60)
+)
+
+FILMWORK_CACHE_TIMEOUT = int(
+    os.environ.get('FILMWORK_CACHE_TIMEOUT', FILMWORK_CACHE_DEFAULT_TIMEOUT)
+)
@@ -8,8 +8,30 @@ DATABASES = {
         'PASSWORD': os.environ.get('DB_PASSWORD'),
         'HOST': os.environ.get('DB_HOST', '127.0.0.1'),
         'PORT': os.environ.get('DB_PORT', 5432),
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 0)),
+        'CONN_HEALTH_CHECKS': (
+            os.environ.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True'
+        ),
+        'CONN_HEALTH_CHECK_IDLE': int(
+            os.environ.get('DB_CONN_HEALTH_CHECK_IDLE', 5)
+        ),
         'OPTIONS': {
             'options': '-c search_path=public,content'
         }
     }
 }
+
+for number, replica in enumerate(
+    os.environ.get('DB_REPLICA_HOSTS', '').split(), start=1
+):
+    host, _, port = replica.partition(':')
+    DATABASES[f'replica_{number}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['movies.db.ReplicaRouter']
+
+REPLICA_STICKY_SECONDS = int(os.environ.get('DB_REPLICA_STICKY_SECONDS', 10))
@@ -0,0 +1,7 @@
+INSTALLED_APPS += ['debug_toolbar']  # noqa: F821
+
+MIDDLEWARE.insert(  # noqa: F821
+    0, 'debug_toolbar.middleware.DebugToolbarMiddleware'
+)
+
+INTERNAL_IPS = ['127.0.0.1']
@@ -0,0 +1,33 @@
+import os
+
+QUERY_INSTRUMENTATION = {
+    'SAMPLE_RATE': float(os.environ.get('QUERY_SAMPLE_RATE', 0)),
+    'SLOWEST_COUNT': int(os.environ.get('QUERY_SLOWEST_COUNT', 3)),
+    'N_PLUS_ONE_THRESHOLD': int(
+        os.environ.get('QUERY_N_PLUS_ONE_THRESHOLD', 10)
+    ),
+    'RESPONSE_HEADERS': os.environ.get('QUERY_RESPONSE_HEADERS') == 'True',
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'default': {
+            'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'default',
+        },
+    },
+    'loggers': {
+        'movies.instrumentation': {
+            'handlers': ['console'],
+            'level': os.environ.get('QUERY_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
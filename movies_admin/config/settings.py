@@ -9,6 +9,8 @@ load_dotenv()
 
 include(
     'components/database.py',
+    'components/instrumentation.py',
+    'components/cache.py',
 )
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -26,12 +28,12 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    "debug_toolbar",
     'movies.apps.MoviesConfig',
 ]
 
 MIDDLEWARE = [
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    'movies.middleware.QueryInstrumentationMiddleware',
+    'movies.middleware.ReplicaStickinessMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -92,3 +94,6 @@ STATIC_URL = '/static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOCALE_PATHS = ['movies/locale']
+
+if DEBUG:
+    include('components/debug_toolbar.py')
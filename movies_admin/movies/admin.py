@@ -1,19 +1,317 @@
+import uuid
+
+from django import forms
+from django.conf import settings
 from django.contrib import admin
-from .models import Genre, GenreFilmwork, Filmwork, Person, PersonFilmwork
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import prefetch_related_objects
+from django.forms.models import BaseInlineFormSet
+from django.forms.utils import ErrorDict
+from django.http import QueryDict
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils.translation import gettext_lazy as _
+
+from .constants import INLINE_PER_PAGE, RATING_BUCKET_SIZE, RATING_MAX
+from .models import (CatalogStat, Genre, GenreFilmwork, Filmwork, Person,
+                     PersonFilmwork)
+from .stats import get_catalog_stats
+
+
+PAGE_SUFFIX = 'page'
+TARGET_PAGE_SUFFIX = 'goto'
+
+RATING_BUCKETS = [
+    str(start) for start in range(0, RATING_MAX, RATING_BUCKET_SIZE)
+] + ['none']
+
+
+def rating_bucket_label(bucket):
+    if bucket == 'none':
+        return _('No rating')
+    start = int(bucket)
+    return f'{start}–{min(start + RATING_BUCKET_SIZE, RATING_MAX)}'
+
+
+class FacetListFilter(admin.SimpleListFilter):
+    dimension = None
+
+    def lookups(self, request, model_admin):
+        counts = get_catalog_stats()[self.dimension]
+        return [
+            (value, f'{label} ({counts.get(value, 0)})')
+            for value, label in self.facet_choices()
+        ]
+
+
+class TypeFacetFilter(FacetListFilter):
+    title = _('type')
+    parameter_name = 'type'
+    dimension = CatalogStat.Dimension.type
+
+    def facet_choices(self):
+        return Filmwork.FilmWorkType.choices
+
+    def queryset(self, request, queryset):
+        if self.value():
+            if self.value() not in Filmwork.FilmWorkType.values:
+                raise IncorrectLookupParameters(self.value())
+            return queryset.filter(type=self.value())
+        return queryset
+
+
+class GenreFacetFilter(FacetListFilter):
+    title = _('Genre')
+    parameter_name = 'genre'
+    dimension = CatalogStat.Dimension.genre
+
+    def facet_choices(self):
+        return [
+            (str(pk), name)
+            for pk, name in Genre.objects.order_by('name').values_list(
+                'id', 'name'
+            )
+        ]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            try:
+                genre_id = uuid.UUID(self.value())
+            except ValueError:
+                raise IncorrectLookupParameters(self.value())
+            return queryset.filter(genres__id=genre_id)
+        return queryset
+
+
+class RatingFacetFilter(FacetListFilter):
+    title = _('Rating of film')
+    parameter_name = 'rating_bucket'
+    dimension = CatalogStat.Dimension.rating
+
+    def facet_choices(self):
+        return [
+            (bucket, rating_bucket_label(bucket)) for bucket in RATING_BUCKETS
+        ]
+
+    def queryset(self, request, queryset):
+        if self.value() and self.value() not in RATING_BUCKETS:
+            raise IncorrectLookupParameters(self.value())
+        if self.value() == 'none':
+            return queryset.filter(rating__isnull=True)
+        if self.value():
+            start = int(self.value())
+            if start + RATING_BUCKET_SIZE >= RATING_MAX:
+                return queryset.filter(rating__gte=start)
+            return queryset.filter(
+                rating__gte=start, rating__lt=start + RATING_BUCKET_SIZE
+            )
+        return queryset
+
+
+class ChangedRowsInlineForm(forms.ModelForm):
+    """Skips cleaning of stored rows the user has not touched."""
+
+    def full_clean(self):
+        if (
+            self.is_bound
+            and not self.instance._state.adding
+            and not self.has_changed()
+        ):
+            self._errors = ErrorDict()
+            self.cleaned_data = {}
+            return
+        super().full_clean()
+
+    def validate_unique(self):
+        # Rows duplicating a stored row, possibly on another inline page, are
+        # reported on the form even when a constrained field is read-only or
+        # left out of the inline's fields.
+        constrained = {
+            name
+            for constraint in self.instance._meta.total_unique_constraints
+            for name in constraint.fields
+        }
+        exclude = [
+            name for name in self._get_validation_exclusions()
+            if name not in constrained or name in self._errors
+        ]
+        try:
+            self.instance.validate_unique(exclude=exclude)
+        except ValidationError as error:
+            self._update_errors(error)
+
+
+class PreloadedAutocompleteSelect(AutocompleteSelect):
+    """Renders the selected option from the row's already fetched object."""
 
+    selected_object = None
 
-class PersonFilmWorkInline(admin.TabularInline):
+    def optgroups(self, name, value, attr=None):
+        obj = self.selected_object
+        to_field = self.field.remote_field.get_related_field().attname
+        if obj is None or value != [str(getattr(obj, to_field))]:
+            return super().optgroups(name, value, attr)
+        default = (None, [], 0)
+        if not self.is_required:
+            default[1].append(self.create_option(name, '', '', False, 0))
+        default[1].append(self.create_option(
+            name,
+            getattr(obj, to_field),
+            self.choices.field.label_from_instance(obj),
+            True,
+            len(default[1]),
+        ))
+        return [default]
+
+
+class PaginatedInlineFormSet(BaseInlineFormSet):
+    per_page = INLINE_PER_PAGE
+    page_number = 1
+    query = None
+
+    @classmethod
+    def get_page_param(cls):
+        return f'{cls.get_default_prefix()}-{PAGE_SUFFIX}'
+
+    @classmethod
+    def get_target_page_param(cls):
+        return f'{cls.get_default_prefix()}-{TARGET_PAGE_SUFFIX}'
+
+    def get_queryset(self):
+        if not hasattr(self, 'page'):
+            # Rows added while a page is open land at the end instead of
+            # shifting the rows of earlier pages.
+            self.full_queryset = super().get_queryset().order_by(
+                'created', self.model._meta.pk.name
+            )
+            self.paginator = Paginator(self.full_queryset, self.per_page)
+            self.page = self.paginator.get_page(self.page_number)
+            self._queryset = self.page.object_list
+        return self._queryset
+
+    def _existing_object(self, pk):
+        # Posted rows are looked up by pk among all rows of the parent, not
+        # only the current page, so a page that shifted between rendering
+        # and saving still updates the rows the user edited.
+        if not hasattr(self, '_object_dict'):
+            pk_field = self.model._meta.pk
+            to_python = self._get_to_python(pk_field)
+            pks = []
+            for i in range(self.initial_form_count()):
+                value = self.data.get(f'{self.add_prefix(i)}-{pk_field.name}')
+                try:
+                    pks.append(to_python(value))
+                except ValidationError:
+                    continue
+            self.get_queryset()
+            self._object_dict = self.full_queryset.in_bulk(
+                [pk for pk in pks if pk is not None]
+            )
+        return self._object_dict.get(pk)
+
+    def _construct_form(self, i, **kwargs):
+        form = super()._construct_form(i, **kwargs)
+        if form.instance._state.adding:
+            return form
+        for name, field in form.fields.items():
+            widget = getattr(field.widget, 'widget', field.widget)
+            if not isinstance(widget, PreloadedAutocompleteSelect):
+                continue
+            related = self.model._meta.get_field(name)
+            if related.is_cached(form.instance):
+                widget.selected_object = related.get_cached_value(
+                    form.instance
+                )
+        return form
+
+    def page_links(self):
+        """(number, query of a plain link, query of a "save and continue"
+        submit that then opens the page) for every page link."""
+        self.get_queryset()
+        links = []
+        for number in self.paginator.get_elided_page_range(self.page.number):
+            if number == self.page.number or number == Paginator.ELLIPSIS:
+                links.append((number, None, None))
+                continue
+            query = self.query.copy()
+            query[self.get_page_param()] = number
+            target = self.query.copy()
+            target[self.get_target_page_param()] = number
+            links.append((number, query.urlencode(), target.urlencode()))
+        return links
+
+
+class PaginatedTabularInline(admin.TabularInline):
+    form = ChangedRowsInlineForm
+    formset = PaginatedInlineFormSet
+    template = 'admin/edit_inline/paginated_tabular.html'
+    per_page = INLINE_PER_PAGE
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.per_page = self.per_page
+        formset.page_number = request.GET.get(formset.get_page_param(), 1)
+        formset.query = request.GET.copy()
+        return formset
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name in self.get_autocomplete_fields(request):
+            kwargs['widget'] = PreloadedAutocompleteSelect(
+                db_field, self.admin_site, using=kwargs.get('using')
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+class PersonFilmWorkInline(PaginatedTabularInline):
     model = PersonFilmwork
     extra = 3
+    autocomplete_fields = ('film_work', 'person')
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'film_work', 'person'
+        )
 
-class GenreFilmworkInline(admin.TabularInline):
+
+class GenreFilmworkInline(PaginatedTabularInline):
     model = GenreFilmwork
     min_num = 1
     extra = 0
+    autocomplete_fields = ('genre',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'film_work', 'genre'
+        )
+
+class PaginatedInlinesAdmin(admin.ModelAdmin):
+    """Opens the inline page a page link asked for after "save and
+    continue", so switching pages never drops unsaved edits."""
+
+    def response_change(self, request, obj):
+        response = super().response_change(request, obj)
+        if '_continue' not in request.POST:
+            return response
+        pages = {}
+        for key, value in request.GET.items():
+            if key.endswith(f'-{PAGE_SUFFIX}'):
+                pages[key] = value
+            elif key.endswith(f'-{TARGET_PAGE_SUFFIX}'):
+                prefix = key[:-len(TARGET_PAGE_SUFFIX)]
+                pages[f'{prefix}{PAGE_SUFFIX}'] = value
+        if pages:
+            query = QueryDict(mutable=True)
+            query.update(pages)
+            separator = '&' if '?' in response['Location'] else '?'
+            response['Location'] += separator + query.urlencode()
+        return response
+
 
 @admin.register(Filmwork)
-class FilmworkAdmin(admin.ModelAdmin):
+class FilmworkAdmin(PaginatedInlinesAdmin):
     inlines = (
         GenreFilmworkInline,
         PersonFilmWorkInline
@@ -22,6 +320,7 @@ class FilmworkAdmin(admin.ModelAdmin):
         'title',
         'description',
         'type',
+        'genre_names',
         'created',
         'rating',
         'created',
@@ -33,12 +332,84 @@ class FilmworkAdmin(admin.ModelAdmin):
     list_editable = (
         'type',
     )
-    list_filter = ('type',)
+    list_filter = (
+        TypeFacetFilter,
+        GenreFacetFilter,
+        RatingFacetFilter,
+    )
     search_fields = (
         'title',
         'description',
     )
 
+    @admin.display(description=_('Genres'))
+    def genre_names(self, obj):
+        return ', '.join(sorted(genre.name for genre in obj.genres.all()))
+
+    def get_changelist_instance(self, request):
+        changelist = super().get_changelist_instance(request)
+        prefetch_related_objects(changelist.result_list, 'genres')
+        return changelist
+
+    def get_urls(self):
+        return [
+            path(
+                'stats/',
+                self.admin_site.admin_view(self.stats_view),
+                name='movies_filmwork_stats',
+            ),
+        ] + super().get_urls()
+
+    def stats_view(self, request):
+        stats = get_catalog_stats()
+        genre_counts = stats[CatalogStat.Dimension.genre]
+        person_counts = stats[CatalogStat.Dimension.person]
+        types = [
+            (label, stats[CatalogStat.Dimension.type].get(value, 0))
+            for value, label in Filmwork.FilmWorkType.choices
+        ]
+        ratings = [
+            (
+                rating_bucket_label(bucket),
+                stats[CatalogStat.Dimension.rating].get(bucket, 0)
+            )
+            for bucket in RATING_BUCKETS
+        ]
+        genres = sorted(
+            (
+                (name, genre_counts[str(pk)])
+                for pk, name in Genre.objects.filter(
+                    id__in=genre_counts
+                ).values_list('id', 'name')
+            ),
+            key=lambda row: -row[1]
+        )
+        persons = sorted(
+            (
+                (full_name, person_counts[str(pk)])
+                for pk, full_name in Person.objects.filter(
+                    id__in=person_counts
+                ).values_list('id', 'full_name')
+            ),
+            key=lambda row: -row[1]
+        )
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': _('Catalog statistics'),
+            'refreshed': stats['refreshed'],
+            'timeout': settings.CATALOG_STATS_CACHE_TIMEOUT,
+            'sections': (
+                (_('type'), types),
+                (_('Rating of film'), ratings),
+                (_('Genres'), genres),
+                (_('Top persons by credits'), persons),
+            ),
+        }
+        return TemplateResponse(
+            request, 'admin/movies/catalog_stats.html', context
+        )
+
 @admin.register(Genre)
 class GenreAdmin(admin.ModelAdmin):
     list_display = (
@@ -48,9 +419,12 @@ class GenreAdmin(admin.ModelAdmin):
     list_display_links = (
         'name',
     )
+    search_fields = (
+        'name',
+    )
 
 @admin.register(Person)
-class PersonAdmin(admin.ModelAdmin):
+class PersonAdmin(PaginatedInlinesAdmin):
     inlines = (
         PersonFilmWorkInline,
     )
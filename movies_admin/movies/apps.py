@@ -1,7 +1,15 @@
 from django.apps import AppConfig
+from django.core.signals import request_finished, request_started
 from django.utils.translation import gettext_lazy as _
 
 class MoviesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'movies'
     verbose_name = _('movies')
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .db import close_unusable_connections, mark_connections_idle
+
+        request_started.connect(close_unusable_connections)
+        request_finished.connect(mark_connections_idle)
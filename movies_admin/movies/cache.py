@@ -0,0 +1,129 @@
+from itertools import islice
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Prefetch
+
+from .constants import INVALIDATION_BATCH_SIZE
+from .db import use_primary
+from .models import Filmwork, PersonFilmwork
+
+VERSION_KEY = 'movies:filmwork:{id}:version'
+AGGREGATE_KEY = 'movies:filmwork:{id}:{version}'
+
+
+def new_version():
+    return uuid4().hex
+
+
+def serialize_filmwork(filmwork):
+    persons = {role: [] for role in PersonFilmwork.PersonRole.values}
+    for credit in filmwork.personfilmwork_set.all():
+        persons.setdefault(credit.role, []).append({
+            'id': str(credit.person_id),
+            'full_name': credit.person.full_name,
+        })
+    return {
+        'id': str(filmwork.id),
+        'title': filmwork.title,
+        'description': filmwork.description,
+        'creation_date': (
+            filmwork.creation_date.isoformat()
+            if filmwork.creation_date else None
+        ),
+        'rating': filmwork.rating,
+        'type': filmwork.type,
+        'modified': filmwork.modified.timestamp(),
+        'genres': sorted(genre.name for genre in filmwork.genres.all()),
+        'persons': persons,
+    }
+
+
+@use_primary()
+def load_filmworks(ids):
+    queryset = Filmwork.objects.filter(id__in=ids).prefetch_related(
+        'genres',
+        Prefetch(
+            'personfilmwork_set',
+            queryset=PersonFilmwork.objects.select_related('person'),
+        ),
+    )
+    return {str(filmwork.id): serialize_filmwork(filmwork)
+            for filmwork in queryset}
+
+
+class FilmworkCache:
+    """Serialized films with their genres and persons by role.
+
+    Every film has a random version token under its own key, and entries are
+    stored under the token that was current when the fill started.
+    Invalidation replaces the token, so a fill that raced with a write lands
+    under a token nobody reads any more instead of overwriting fresh data.
+    Fills always read from the primary so replica lag is never cached.
+    """
+
+    def __init__(self, alias='default'):
+        self.alias = alias
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get(self, film_work_id):
+        return self.get_many([film_work_id]).get(str(film_work_id))
+
+    def get_versions(self, ids):
+        keys = {VERSION_KEY.format(id=pk): pk for pk in ids}
+        versions = self.cache.get_many(keys)
+        unversioned = [key for key in keys if key not in versions]
+        if unversioned:
+            for key in unversioned:
+                self.cache.add(key, new_version(), None)
+            versions.update(self.cache.get_many(unversioned))
+        return {keys[key]: version for key, version in versions.items()}
+
+    def get_many(self, film_work_ids):
+        ids = [str(film_work_id) for film_work_id in film_work_ids]
+        versions = self.get_versions(ids)
+        aggregate_keys = {
+            AGGREGATE_KEY.format(id=pk, version=version): pk
+            for pk, version in versions.items()
+        }
+        result = {
+            aggregate_keys[key]: aggregate
+            for key, aggregate in self.cache.get_many(aggregate_keys).items()
+        }
+        missing = [pk for pk in ids if pk not in result]
+        self.hits += len(result)
+        self.misses += len(missing)
+        if missing:
+            loaded = load_filmworks(missing)
+            for pk, aggregate in loaded.items():
+                if pk in versions:
+                    self.cache.add(
+                        AGGREGATE_KEY.format(id=pk, version=versions[pk]),
+                        aggregate,
+                        settings.FILMWORK_CACHE_TIMEOUT,
+                    )
+            result.update(loaded)
+        return result
+
+    def invalidate(self, film_work_ids):
+        film_work_ids = iter(film_work_ids)
+        while True:
+            batch = list(islice(film_work_ids, INVALIDATION_BATCH_SIZE))
+            if not batch:
+                break
+            self.cache.set_many(
+                {VERSION_KEY.format(id=pk): new_version() for pk in batch},
+                None,
+            )
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+filmwork_cache = FilmworkCache()
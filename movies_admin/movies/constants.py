@@ -1,4 +1,9 @@
 RATING_MIN = 0
 RATING_MAX = 100
 SLICE_LENGTH = 20
-MAX_LENGHT = 255
\ No newline at end of file
+MAX_LENGHT = 255
+OUTBOX_BATCH_SIZE = 500
+RATING_BUCKET_SIZE = 10
+TOP_PERSONS_COUNT = 20
+INLINE_PER_PAGE = 20
+INVALIDATION_BATCH_SIZE = 1000
@@ -0,0 +1,98 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PRIMARY_ONLY_APPS = {'admin', 'auth', 'contenttypes', 'sessions'}
+
+_use_primary = ContextVar('use_primary', default=False)
+_replica = ContextVar('replica', default=None)
+
+
+def get_replicas():
+    return [
+        alias for alias in settings.DATABASES if alias.startswith('replica_')
+    ]
+
+
+@contextmanager
+def use_primary(enabled=True):
+    token = _use_primary.set(enabled)
+    try:
+        yield
+    finally:
+        _use_primary.reset(token)
+
+
+@contextmanager
+def use_replica(alias):
+    """Sends every replica read in the block to the same alias."""
+    token = _replica.set(alias)
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+class ReplicaRouter:
+    """Sends reads to a replica_* alias, everything else to default.
+
+    Reads stay on the primary inside use_primary(), inside a transaction on
+    the primary and for apps whose rows are read right after being written.
+    Inside use_replica() every read goes to the same replica, so one request
+    never mixes replicas with different lag; elsewhere one is picked at
+    random.
+    """
+
+    def __init__(self):
+        self.replicas = get_replicas()
+
+    def db_for_read(self, model, **hints):
+        if (
+            not self.replicas
+            or _use_primary.get()
+            or model._meta.app_label in PRIMARY_ONLY_APPS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return _replica.get() or random.choice(self.replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def mark_connections_idle(**kwargs):
+    for connection in connections.all():
+        if connection.connection is not None:
+            connection.idle_since = time.monotonic()
+
+
+def close_unusable_connections(**kwargs):
+    """Drop persistent connections that died while idle between requests.
+
+    Django only pings connections that already raised an error, so one
+    closed by a server restart or an idle timeout would fail the first
+    query of the next request. Connections idle for at least
+    CONN_HEALTH_CHECK_IDLE seconds are pinged once before being reused.
+    """
+    now = time.monotonic()
+    for connection in connections.all():
+        settings_dict = connection.settings_dict
+        idle_since = getattr(connection, 'idle_since', None)
+        if (
+            settings_dict.get('CONN_HEALTH_CHECKS')
+            and connection.connection is not None
+            and idle_since is not None
+            and now - idle_since >= settings_dict['CONN_HEALTH_CHECK_IDLE']
+            and not connection.is_usable()
+        ):
+            connection.close()
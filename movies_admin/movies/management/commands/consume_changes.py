@@ -0,0 +1,42 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from movies.constants import OUTBOX_BATCH_SIZE
+from movies.outbox import acknowledge, fetch_changes, prune_changes
+
+
+class Command(BaseCommand):
+    help = 'Print pending catalog changes for a consumer as JSON lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument('consumer')
+        parser.add_argument(
+            '--batch-size', type=int, default=OUTBOX_BATCH_SIZE
+        )
+        parser.add_argument(
+            '--prune', action='store_true',
+            help='delete entries already consumed by every consumer'
+        )
+
+    def handle(self, *args, **options):
+        consumed = 0
+        while True:
+            batch = fetch_changes(options['consumer'], options['batch_size'])
+            if not batch.changes:
+                break
+            for change in batch.changes:
+                self.stdout.write(json.dumps({
+                    'table': change.table_name,
+                    'id': str(change.entity_id),
+                    'op': change.op,
+                    'film_work_id': (
+                        str(change.film_work_id)
+                        if change.film_work_id else None
+                    ),
+                }))
+            acknowledge(batch)
+            consumed += len(batch.changes)
+        self.stderr.write(f'{consumed} changes consumed')
+        if options['prune']:
+            self.stderr.write(f'{prune_changes()} entries pruned')
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from movies.stats import fold_catalog_stats
+
+
+class Command(BaseCommand):
+    help = 'Add pending catalog statistic deltas to the counters'
+
+    def handle(self, *args, **options):
+        folded = fold_catalog_stats()
+        self.stdout.write(f'Catalog statistics folded: {folded} counters')
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from movies.partitioning import (get_partition_count,
+                                 repartition_person_film_work)
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild content.person_film_work hash-partitioned by film_work_id, '
+        'or as a plain table with 0 partitions'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('partitions', type=int)
+
+    def handle(self, *args, **options):
+        partitions = options['partitions']
+        if partitions < 0:
+            raise CommandError('partitions must not be negative')
+        current = get_partition_count()
+        if current == partitions:
+            self.stdout.write(
+                f'content.person_film_work already has {current} partitions'
+            )
+            return
+        repartition_person_film_work(partitions)
+        self.stdout.write(
+            f'content.person_film_work repartitioned: '
+            f'{current} -> {partitions} partitions'
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from movies.stats import rebuild_catalog_stats
+
+
+class Command(BaseCommand):
+    help = 'Recount catalog statistics from the content tables'
+
+    def handle(self, *args, **options):
+        rebuild_catalog_stats()
+        self.stdout.write('Catalog statistics rebuilt')
@@ -0,0 +1,131 @@
+import heapq
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .db import get_replicas, use_primary, use_replica
+
+logger = logging.getLogger('movies.instrumentation')
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+PRIMARY_COOKIE = 'db_primary'
+
+PLACEHOLDER_LIST_RE = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_sql(sql):
+    sql = LITERAL_RE.sub('?', sql)
+    sql = PLACEHOLDER_LIST_RE.sub('(...)', sql)
+    return WHITESPACE_RE.sub(' ', sql).strip()
+
+
+class QueryCollector:
+    def __init__(self, slowest_count):
+        self.slowest_count = slowest_count
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = []
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.count += 1
+            self.duration += duration
+            self.statements[normalize_sql(sql)] += 1
+            entry = (duration, self.count, sql)
+            if len(self.slowest) < self.slowest_count:
+                heapq.heappush(self.slowest, entry)
+            elif self.slowest and duration > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    def repeated(self, threshold):
+        return [
+            (sql, count) for sql, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+class QueryInstrumentationMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = getattr(settings, 'QUERY_INSTRUMENTATION', {})
+        self.sample_rate = config.get('SAMPLE_RATE', 0)
+        self.slowest_count = config.get('SLOWEST_COUNT', 3)
+        self.threshold = config.get('N_PLUS_ONE_THRESHOLD', 10)
+        self.headers = config.get('RESPONSE_HEADERS', False)
+
+    def __call__(self, request):
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        collector = QueryCollector(self.slowest_count)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(collector))
+            response = self.get_response(request)
+        self.report(request, response, collector)
+        return response
+
+    def report(self, request, response, collector):
+        duration_ms = collector.duration * 1000
+        repeated = collector.repeated(self.threshold)
+        slowest = sorted(collector.slowest, reverse=True)
+        if self.headers:
+            response['X-DB-Query-Count'] = str(collector.count)
+            response['X-DB-Query-Time'] = f'{duration_ms:.2f}'
+            response['X-DB-Slowest-Query-Times'] = ', '.join(
+                f'{duration * 1000:.2f}' for duration, _, _ in slowest
+            )
+            response['Server-Timing'] = (
+                f'db;dur={duration_ms:.2f};desc="{collector.count} queries"'
+            )
+        logger.info(
+            '%s %s: %d queries, %.2f ms; slowest: %s',
+            request.method, request.path, collector.count, duration_ms,
+            ' | '.join(
+                f'{duration * 1000:.2f} ms {normalize_sql(sql)}'
+                for duration, _, sql in slowest
+            )
+        )
+        for sql, count in repeated:
+            logger.warning(
+                'Possible N+1 on %s %s: %d x %s',
+                request.method, request.path, count, sql
+            )
+
+
+class ReplicaStickinessMiddleware:
+    """Reads from the primary for a while after a client has written and
+    from a single replica per request otherwise."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.replicas = get_replicas()
+
+    def __call__(self, request):
+        writes = request.method not in SAFE_METHODS
+        replica = random.choice(self.replicas) if self.replicas else None
+        with use_primary(writes or PRIMARY_COOKIE in request.COOKIES):
+            with use_replica(replica):
+                response = self.get_response(request)
+        if writes:
+            response.set_cookie(
+                PRIMARY_COOKIE,
+                '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
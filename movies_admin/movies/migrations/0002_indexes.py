@@ -0,0 +1,70 @@
+# Generated by Django 3.2.25 on 2026-10-19 20:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='genrefilmwork',
+            name='genre_film_work_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='personfilmwork',
+            name='person_film_work_role_idx',
+        ),
+        migrations.AlterField(
+            model_name='genrefilmwork',
+            name='film_work',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='movies.filmwork'),
+        ),
+        migrations.AlterField(
+            model_name='genrefilmwork',
+            name='genre',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='movies.genre'),
+        ),
+        migrations.AlterField(
+            model_name='personfilmwork',
+            name='film_work',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='movies.filmwork'),
+        ),
+        migrations.AlterField(
+            model_name='personfilmwork',
+            name='person',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='movies.person'),
+        ),
+        migrations.AddIndex(
+            model_name='filmwork',
+            index=models.Index(fields=['modified', 'id'], name='film_work_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='genre',
+            index=models.Index(fields=['modified', 'id'], name='genre_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='genrefilmwork',
+            index=models.Index(fields=['film_work'], include=('genre',), name='genre_film_work_film_work_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(fields=['modified', 'id'], name='person_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personfilmwork',
+            index=models.Index(fields=['person'], include=('film_work', 'role'), name='person_film_work_person_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='genrefilmwork',
+            constraint=models.UniqueConstraint(fields=('genre', 'film_work'), name='genre_film_work_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='personfilmwork',
+            constraint=models.UniqueConstraint(fields=('film_work', 'person', 'role'), name='person_film_work_role_idx'),
+        ),
+    ]
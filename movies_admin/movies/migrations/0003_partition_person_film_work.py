@@ -0,0 +1,13 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Marker only: person_film_work is partitioned, repartitioned or
+    turned back into a plain table with the partition_person_film_work
+    management command, independently of the migration history."""
+
+    dependencies = [
+        ('movies', '0002_indexes'),
+    ]
+
+    operations = []
@@ -0,0 +1,109 @@
+# Generated by Django 3.2.25 on 2026-10-19 20:18
+
+from django.db import migrations, models
+
+LOGGED_TABLES = (
+    'film_work',
+    'genre',
+    'person',
+    'genre_film_work',
+    'person_film_work',
+)
+
+CREATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION content.log_change() RETURNS trigger AS $$
+DECLARE
+    new_row jsonb := CASE WHEN TG_OP <> 'DELETE' THEN to_jsonb(NEW) END;
+    old_row jsonb := CASE WHEN TG_OP <> 'INSERT' THEN to_jsonb(OLD) END;
+    film_key text := CASE
+        WHEN TG_ARGV[0] = 'film_work' THEN 'id' ELSE 'film_work_id'
+    END;
+BEGIN
+    INSERT INTO content.change_log
+        (txid, table_name, entity_id, op, film_work_id, changed)
+    VALUES (
+        txid_current(),
+        TG_ARGV[0],
+        (coalesce(new_row, old_row) ->> 'id')::uuid,
+        left(TG_OP, 1),
+        (coalesce(new_row, old_row) ->> film_key)::uuid,
+        now()
+    );
+    IF TG_OP = 'UPDATE'
+            AND old_row ->> film_key IS DISTINCT FROM new_row ->> film_key THEN
+        INSERT INTO content.change_log
+            (txid, table_name, entity_id, op, film_work_id, changed)
+        VALUES (
+            txid_current(),
+            TG_ARGV[0],
+            (old_row ->> 'id')::uuid,
+            'U',
+            (old_row ->> film_key)::uuid,
+            now()
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+CREATE_TRIGGER = """
+CREATE TRIGGER {table}_change_log
+AFTER INSERT OR UPDATE OR DELETE ON content.{table}
+FOR EACH ROW EXECUTE FUNCTION content.log_change('{table}')
+"""
+
+DROP_TRIGGER = 'DROP TRIGGER IF EXISTS {table}_change_log ON content.{table}'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0003_partition_person_film_work'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('txid', models.BigIntegerField()),
+                ('table_name', models.TextField(verbose_name='Table')),
+                ('entity_id', models.UUIDField()),
+                ('op', models.CharField(choices=[('I', 'insert'), ('U', 'update'), ('D', 'delete')], max_length=1, verbose_name='Operation')),
+                ('film_work_id', models.UUIDField(null=True)),
+                ('changed', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Change',
+                'verbose_name_plural': 'Changes',
+                'db_table': 'content"."change_log',
+            },
+        ),
+        migrations.CreateModel(
+            name='ChangeLogCursor',
+            fields=[
+                ('consumer', models.CharField(max_length=255, primary_key=True, serialize=False, verbose_name='Consumer')),
+                ('txid', models.BigIntegerField(default=0)),
+                ('change_id', models.BigIntegerField(default=0)),
+                ('modified', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Change consumer',
+                'verbose_name_plural': 'Change consumers',
+                'db_table': 'content"."change_log_cursor',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='changelog',
+            index=models.Index(fields=['txid', 'id'], name='change_log_txid_idx'),
+        ),
+        migrations.RunSQL(
+            CREATE_FUNCTION,
+            'DROP FUNCTION IF EXISTS content.log_change()',
+        ),
+        migrations.RunSQL(
+            [CREATE_TRIGGER.format(table=table) for table in LOGGED_TABLES],
+            [DROP_TRIGGER.format(table=table) for table in LOGGED_TABLES],
+        ),
+    ]
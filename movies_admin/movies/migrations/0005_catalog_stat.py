@@ -0,0 +1,135 @@
+# Generated by Django 3.2.25 on 2026-10-19 20:19
+
+from django.db import migrations, models
+
+CREATE_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION content.rating_bucket(rating float) RETURNS text AS $$
+    SELECT coalesce((least(floor(rating / 10), 9) * 10)::int::text, 'none')
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION content.catalog_stat_key(
+    row_data jsonb, dimension text, col text
+) RETURNS text AS $$
+    SELECT CASE
+        WHEN row_data IS NULL THEN NULL
+        WHEN dimension = 'rating'
+            THEN content.rating_bucket((row_data ->> col)::float)
+        ELSE row_data ->> col
+    END
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION content.bump_catalog_stat(
+    stat_dimension text, stat_key text, delta integer
+) RETURNS void AS $$
+    INSERT INTO content.catalog_stat (dimension, key, value)
+    VALUES (stat_dimension, stat_key, delta)
+    ON CONFLICT (dimension, key)
+    DO UPDATE SET value = content.catalog_stat.value + EXCLUDED.value
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION content.count_catalog_stat() RETURNS trigger AS $$
+DECLARE
+    old_key text := content.catalog_stat_key(
+        CASE WHEN TG_OP <> 'INSERT' THEN to_jsonb(OLD) END,
+        TG_ARGV[0], TG_ARGV[1]
+    );
+    new_key text := content.catalog_stat_key(
+        CASE WHEN TG_OP <> 'DELETE' THEN to_jsonb(NEW) END,
+        TG_ARGV[0], TG_ARGV[1]
+    );
+BEGIN
+    IF old_key IS NOT DISTINCT FROM new_key THEN
+        RETURN NULL;
+    END IF;
+    IF old_key IS NOT NULL THEN
+        PERFORM content.bump_catalog_stat(TG_ARGV[0], old_key, -1);
+    END IF;
+    IF new_key IS NOT NULL THEN
+        PERFORM content.bump_catalog_stat(TG_ARGV[0], new_key, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+DROP_FUNCTIONS = """
+DROP FUNCTION IF EXISTS content.count_catalog_stat();
+DROP FUNCTION IF EXISTS content.bump_catalog_stat(text, text, integer);
+DROP FUNCTION IF EXISTS content.catalog_stat_key(jsonb, text, text);
+DROP FUNCTION IF EXISTS content.rating_bucket(float);
+"""
+
+COUNTED_COLUMNS = (
+    ('film_work', 'type', 'type'),
+    ('film_work', 'rating', 'rating'),
+    ('genre_film_work', 'genre', 'genre_id'),
+    ('person_film_work', 'person', 'person_id'),
+)
+
+CREATE_TRIGGER = """
+CREATE TRIGGER {table}_{dimension}_stat
+AFTER INSERT OR DELETE OR UPDATE OF {column} ON content.{table}
+FOR EACH ROW EXECUTE FUNCTION content.count_catalog_stat('{dimension}', '{column}')
+"""
+
+DROP_TRIGGER = 'DROP TRIGGER IF EXISTS {table}_{dimension}_stat ON content.{table}'
+
+BACKFILL = """
+INSERT INTO content.catalog_stat (dimension, key, value)
+SELECT 'type', type, count(*) FROM content.film_work GROUP BY type
+UNION ALL
+SELECT 'rating', content.rating_bucket(rating), count(*)
+FROM content.film_work GROUP BY 2
+UNION ALL
+SELECT 'genre', genre_id::text, count(*)
+FROM content.genre_film_work GROUP BY genre_id
+UNION ALL
+SELECT 'person', person_id::text, count(*)
+FROM content.person_film_work GROUP BY person_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0004_change_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('type', 'type'), ('rating', 'Rating of film'), ('genre', 'Genre'), ('person', 'Person')], max_length=255, verbose_name='Dimension')),
+                ('key', models.CharField(max_length=255, verbose_name='Key')),
+                ('value', models.BigIntegerField(default=0, verbose_name='Value')),
+            ],
+            options={
+                'verbose_name': 'Catalog statistic',
+                'verbose_name_plural': 'Catalog statistics',
+                'db_table': 'content"."catalog_stat',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='catalogstat',
+            index=models.Index(fields=['dimension', '-value'], name='catalog_stat_value_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='catalogstat',
+            constraint=models.UniqueConstraint(fields=('dimension', 'key'), name='catalog_stat_key_idx'),
+        ),
+        migrations.RunSQL(CREATE_FUNCTIONS, DROP_FUNCTIONS),
+        migrations.RunSQL(
+            [
+                CREATE_TRIGGER.format(
+                    table=table, dimension=dimension, column=column
+                )
+                for table, dimension, column in COUNTED_COLUMNS
+            ],
+            [
+                DROP_TRIGGER.format(table=table, dimension=dimension)
+                for table, dimension, _ in COUNTED_COLUMNS
+            ],
+        ),
+        migrations.RunSQL(BACKFILL, migrations.RunSQL.noop),
+    ]
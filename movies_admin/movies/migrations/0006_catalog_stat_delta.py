@@ -0,0 +1,93 @@
+# Generated by Django 3.2.25 on 2026-10-19 20:34
+
+from django.db import migrations, models
+
+TRIGGER_BODY = """
+CREATE OR REPLACE FUNCTION content.count_catalog_stat() RETURNS trigger AS $$
+DECLARE
+    old_key text := content.catalog_stat_key(
+        CASE WHEN TG_OP <> 'INSERT' THEN to_jsonb(OLD) END,
+        TG_ARGV[0], TG_ARGV[1]
+    );
+    new_key text := content.catalog_stat_key(
+        CASE WHEN TG_OP <> 'DELETE' THEN to_jsonb(NEW) END,
+        TG_ARGV[0], TG_ARGV[1]
+    );
+BEGIN
+    IF old_key IS NOT DISTINCT FROM new_key THEN
+        RETURN NULL;
+    END IF;
+    IF old_key IS NOT NULL THEN
+        {decrement};
+    END IF;
+    IF new_key IS NOT NULL THEN
+        {increment};
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+APPEND_DELTA = (
+    'INSERT INTO content.catalog_stat_delta (dimension, key, delta) '
+    'VALUES (TG_ARGV[0], {key}, {delta})'
+)
+
+BUMP_STAT = 'PERFORM content.bump_catalog_stat(TG_ARGV[0], {key}, {delta})'
+
+CREATE_BUMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION content.bump_catalog_stat(
+    stat_dimension text, stat_key text, delta integer
+) RETURNS void AS $$
+    INSERT INTO content.catalog_stat (dimension, key, value)
+    VALUES (stat_dimension, stat_key, delta)
+    ON CONFLICT (dimension, key)
+    DO UPDATE SET value = content.catalog_stat.value + EXCLUDED.value
+$$ LANGUAGE sql;
+"""
+
+DROP_BUMP_FUNCTION = (
+    'DROP FUNCTION IF EXISTS content.bump_catalog_stat(text, text, integer)'
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0005_catalog_stat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogStatDelta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('type', 'type'), ('rating', 'Rating of film'), ('genre', 'Genre'), ('person', 'Person')], max_length=255, verbose_name='Dimension')),
+                ('key', models.CharField(max_length=255, verbose_name='Key')),
+                ('delta', models.IntegerField(verbose_name='Delta')),
+            ],
+            options={
+                'verbose_name': 'Catalog statistic change',
+                'verbose_name_plural': 'Catalog statistic changes',
+                'db_table': 'content"."catalog_stat_delta',
+            },
+        ),
+        migrations.RunSQL(
+            [
+                TRIGGER_BODY.replace(
+                    '{decrement}', APPEND_DELTA.format(key='old_key', delta=-1)
+                ).replace(
+                    '{increment}', APPEND_DELTA.format(key='new_key', delta=1)
+                ),
+                DROP_BUMP_FUNCTION,
+            ],
+            [
+                CREATE_BUMP_FUNCTION,
+                TRIGGER_BODY.replace(
+                    '{decrement}', BUMP_STAT.format(key='old_key', delta=-1)
+                ).replace(
+                    '{increment}', BUMP_STAT.format(key='new_key', delta=1)
+                ),
+            ],
+        ),
+    ]
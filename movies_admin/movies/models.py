@@ -34,7 +34,11 @@ class Genre(UUIDMixin, TimeStampedMixin):
             models.Index(
                 fields=['name'],
                 name='genre_name_idx'
-            )
+            ),
+            models.Index(
+                fields=['modified', 'id'],
+                name='genre_modified_idx'
+            ),
         ]
 
     def __str__(self):
@@ -52,7 +56,11 @@ class Person(UUIDMixin, TimeStampedMixin):
             models.Index(
                 fields=['full_name'],
                 name='person_full_name_idx'
-            )
+            ),
+            models.Index(
+                fields=['modified', 'id'],
+                name='person_modified_idx'
+            ),
         ]
 
     def __str__(self):
@@ -98,7 +106,11 @@ class Filmwork(UUIDMixin, TimeStampedMixin):
             models.Index(
                 fields=['title'],
                 name='film_work_title_idx'
-            )
+            ),
+            models.Index(
+                fields=['modified', 'id'],
+                name='film_work_modified_idx'
+            ),
         ]
 
     def __str__(self):
@@ -106,18 +118,29 @@ class Filmwork(UUIDMixin, TimeStampedMixin):
 
 
 class GenreFilmwork(UUIDMixin):
-    film_work = models.ForeignKey('Filmwork', on_delete=models.CASCADE)
-    genre = models.ForeignKey('Genre', on_delete=models.CASCADE)
+    film_work = models.ForeignKey(
+        'Filmwork', on_delete=models.CASCADE, db_index=False
+    )
+    genre = models.ForeignKey(
+        'Genre', on_delete=models.CASCADE, db_index=False
+    )
     created = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = "content\".\"genre_film_work"
         verbose_name = _('GenreFilmwork')
-        verbose_name_plural = _('GenreFilmworks')        
+        verbose_name_plural = _('GenreFilmworks')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['genre', 'film_work'],
+                name='genre_film_work_idx'
+            )
+        ]
         indexes = [
             models.Index(
-                fields=['film_work_id', 'genre_id'],
-                name='genre_film_work_idx'
+                fields=['film_work'],
+                include=['genre'],
+                name='genre_film_work_film_work_idx'
             )
         ]
 
@@ -128,8 +151,12 @@ class PersonFilmwork(UUIDMixin):
         director = 'director', _('director')
         writer = 'writer', _('writer')
 
-    film_work = models.ForeignKey('Filmwork', on_delete=models.CASCADE)
-    person = models.ForeignKey('Person', on_delete=models.CASCADE)
+    film_work = models.ForeignKey(
+        'Filmwork', on_delete=models.CASCADE, db_index=False
+    )
+    person = models.ForeignKey(
+        'Person', on_delete=models.CASCADE, db_index=False
+    )
     role = models.TextField(
         _('Role'),
         choices=PersonRole.choices
@@ -140,9 +167,113 @@ class PersonFilmwork(UUIDMixin):
         db_table = "content\".\"person_film_work"
         verbose_name = _('PersonFilmwork')
         verbose_name_plural = _('PersonFilmworks')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['film_work', 'person', 'role'],
+                name='person_film_work_role_idx'
+            )
+        ]
         indexes = [
             models.Index(
-                fields=['film_work_id', 'person_id'],
-                name='person_film_work_role_idx'
+                fields=['person'],
+                include=['film_work', 'role'],
+                name='person_film_work_person_idx'
             )
         ]
+
+
+class ChangeLog(models.Model):
+    class Operation(models.TextChoices):
+        insert = 'I', _('insert')
+        update = 'U', _('update')
+        delete = 'D', _('delete')
+
+    id = models.BigAutoField(primary_key=True)
+    txid = models.BigIntegerField()
+    table_name = models.TextField(_('Table'))
+    entity_id = models.UUIDField()
+    op = models.CharField(
+        _('Operation'),
+        choices=Operation.choices,
+        max_length=1
+    )
+    film_work_id = models.UUIDField(null=True)
+    changed = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "content\".\"change_log"
+        verbose_name = _('Change')
+        verbose_name_plural = _('Changes')
+        indexes = [
+            models.Index(
+                fields=['txid', 'id'],
+                name='change_log_txid_idx'
+            )
+        ]
+
+
+class ChangeLogCursor(models.Model):
+    consumer = models.CharField(
+        _('Consumer'),
+        max_length=MAX_LENGHT,
+        primary_key=True
+    )
+    txid = models.BigIntegerField(default=0)
+    change_id = models.BigIntegerField(default=0)
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "content\".\"change_log_cursor"
+        verbose_name = _('Change consumer')
+        verbose_name_plural = _('Change consumers')
+
+    def __str__(self):
+        return self.consumer[:SLICE_LENGTH]
+
+
+class CatalogStat(models.Model):
+    class Dimension(models.TextChoices):
+        type = 'type', _('type')
+        rating = 'rating', _('Rating of film')
+        genre = 'genre', _('Genre')
+        person = 'person', _('Person')
+
+    dimension = models.CharField(
+        _('Dimension'),
+        choices=Dimension.choices,
+        max_length=MAX_LENGHT
+    )
+    key = models.CharField(_('Key'), max_length=MAX_LENGHT)
+    value = models.BigIntegerField(_('Value'), default=0)
+
+    class Meta:
+        db_table = "content\".\"catalog_stat"
+        verbose_name = _('Catalog statistic')
+        verbose_name_plural = _('Catalog statistics')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dimension', 'key'],
+                name='catalog_stat_key_idx'
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=['dimension', '-value'],
+                name='catalog_stat_value_idx'
+            )
+        ]
+
+
+class CatalogStatDelta(models.Model):
+    dimension = models.CharField(
+        _('Dimension'),
+        choices=CatalogStat.Dimension.choices,
+        max_length=MAX_LENGHT
+    )
+    key = models.CharField(_('Key'), max_length=MAX_LENGHT)
+    delta = models.IntegerField(_('Delta'))
+
+    class Meta:
+        db_table = "content\".\"catalog_stat_delta"
+        verbose_name = _('Catalog statistic change')
+        verbose_name_plural = _('Catalog statistic changes')
@@ -0,0 +1,82 @@
+from dataclasses import dataclass, field
+from typing import Optional
+from uuid import UUID
+
+from django.db import connection, transaction
+from django.db.models import Min, Q
+
+from .constants import OUTBOX_BATCH_SIZE
+from .db import use_primary
+from .models import ChangeLog, ChangeLogCursor
+
+
+@dataclass(frozen=True)
+class Change:
+    table_name: str
+    entity_id: UUID
+    op: str
+    film_work_id: Optional[UUID]
+
+
+@dataclass
+class ChangeBatch:
+    consumer: str
+    txid: int
+    change_id: int
+    changes: list = field(default_factory=list)
+
+
+def visible_txid_horizon():
+    """Changes of transactions below this txid can no longer appear."""
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT txid_snapshot_xmin(txid_current_snapshot())')
+        return cursor.fetchone()[0]
+
+
+def deduplicate(entries):
+    latest = {}
+    for entry in entries:
+        key = (entry.table_name, entry.entity_id, entry.film_work_id)
+        latest.pop(key, None)
+        latest[key] = Change(
+            entry.table_name, entry.entity_id, entry.op, entry.film_work_id
+        )
+    return list(latest.values())
+
+
+@use_primary()
+def fetch_changes(consumer, batch_size=OUTBOX_BATCH_SIZE):
+    position, _ = ChangeLogCursor.objects.get_or_create(consumer=consumer)
+    entries = list(
+        ChangeLog.objects.filter(
+            Q(txid__gt=position.txid)
+            | Q(txid=position.txid, id__gt=position.change_id),
+            txid__lt=visible_txid_horizon(),
+        ).order_by('txid', 'id')[:batch_size]
+    )
+    if not entries:
+        return ChangeBatch(consumer, position.txid, position.change_id)
+    return ChangeBatch(
+        consumer, entries[-1].txid, entries[-1].id, deduplicate(entries)
+    )
+
+
+def acknowledge(batch):
+    ChangeLogCursor.objects.filter(consumer=batch.consumer).update(
+        txid=batch.txid, change_id=batch.change_id
+    )
+
+
+@use_primary()
+@transaction.atomic
+def prune_changes():
+    oldest = ChangeLogCursor.objects.aggregate(txid=Min('txid'))['txid']
+    if oldest is None:
+        return 0
+    change_id = ChangeLogCursor.objects.filter(txid=oldest).aggregate(
+        change_id=Min('change_id')
+    )['change_id']
+    deleted, _ = ChangeLog.objects.filter(
+        Q(txid__lt=oldest) | Q(txid=oldest, id__lte=change_id)
+    ).delete()
+    return deleted
@@ -0,0 +1,108 @@
+from django.db import connection, transaction
+
+COLUMNS = 'id, film_work_id, person_id, role, created'
+
+CREATE_TABLE = """
+CREATE TABLE content.{name} (
+    id uuid NOT NULL,
+    film_work_id uuid NOT NULL,
+    person_id uuid NOT NULL,
+    role text NOT NULL,
+    created timestamp with time zone NOT NULL,
+    CONSTRAINT {name}_pkey PRIMARY KEY ({primary_key}),
+    CONSTRAINT {name}_film_work_id_fk FOREIGN KEY (film_work_id)
+        REFERENCES content.film_work (id) DEFERRABLE INITIALLY DEFERRED,
+    CONSTRAINT {name}_person_id_fk FOREIGN KEY (person_id)
+        REFERENCES content.person (id) DEFERRABLE INITIALLY DEFERRED
+) {partition_by}
+"""
+
+CREATE_PARTITION = """
+CREATE TABLE content.person_film_work_new_p{remainder}
+PARTITION OF content.person_film_work_new
+FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder})
+"""
+
+PARTITION_COUNT_SQL = """
+SELECT count(i.inhrelid)
+FROM pg_partitioned_table p
+LEFT JOIN pg_inherits i ON i.inhparent = p.partrelid
+WHERE p.partrelid = 'content.person_film_work'::regclass
+"""
+
+TRIGGERS_SQL = """
+SELECT pg_get_triggerdef(oid) FROM pg_trigger
+WHERE tgrelid = 'content.person_film_work'::regclass AND NOT tgisinternal
+"""
+
+LOCK_TABLE = 'LOCK TABLE content.person_film_work IN EXCLUSIVE MODE'
+
+RENAME_PARTITION = (
+    'ALTER TABLE content.person_film_work_new_p{remainder} '
+    'RENAME TO person_film_work_p{remainder}'
+)
+
+SWAP_TABLES = (
+    f'INSERT INTO content.person_film_work_new ({COLUMNS}) '
+    f'SELECT {COLUMNS} FROM content.person_film_work',
+    'DROP TABLE content.person_film_work',
+    'ALTER TABLE content.person_film_work_new RENAME TO person_film_work',
+    'ALTER TABLE content.person_film_work '
+    'RENAME CONSTRAINT person_film_work_new_pkey TO person_film_work_pkey',
+    'ALTER TABLE content.person_film_work '
+    'RENAME CONSTRAINT person_film_work_new_film_work_id_fk '
+    'TO person_film_work_film_work_id_fk',
+    'ALTER TABLE content.person_film_work '
+    'RENAME CONSTRAINT person_film_work_new_person_id_fk '
+    'TO person_film_work_person_id_fk',
+    'ALTER TABLE content.person_film_work '
+    'ADD CONSTRAINT person_film_work_role_idx '
+    'UNIQUE (film_work_id, person_id, role)',
+    'CREATE INDEX person_film_work_person_idx '
+    'ON content.person_film_work (person_id) INCLUDE (film_work_id, role)',
+)
+
+
+def get_partition_count():
+    """Hash partitions of content.person_film_work, 0 for a plain table."""
+    with connection.cursor() as cursor:
+        cursor.execute(PARTITION_COUNT_SQL)
+        row = cursor.fetchone()
+        return row[0] if row else 0
+
+
+@transaction.atomic
+def repartition_person_film_work(partitions):
+    """Rebuild content.person_film_work with the given number of hash
+    partitions on film_work_id, or as a plain table for 0.
+
+    The primary key has to contain the partition key, so a partitioned
+    table uses (id, film_work_id). The change log and statistics triggers
+    are copied to the new table; the copy itself fires neither.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(LOCK_TABLE)
+        cursor.execute(TRIGGERS_SQL)
+        triggers = [row[0] for row in cursor.fetchall()]
+        if partitions:
+            cursor.execute(CREATE_TABLE.format(
+                name='person_film_work_new',
+                primary_key='id, film_work_id',
+                partition_by='PARTITION BY HASH (film_work_id)',
+            ))
+            for remainder in range(partitions):
+                cursor.execute(CREATE_PARTITION.format(
+                    modulus=partitions, remainder=remainder
+                ))
+        else:
+            cursor.execute(CREATE_TABLE.format(
+                name='person_film_work_new',
+                primary_key='id',
+                partition_by='',
+            ))
+        for statement in SWAP_TABLES:
+            cursor.execute(statement)
+        for remainder in range(partitions):
+            cursor.execute(RENAME_PARTITION.format(remainder=remainder))
+        for trigger in triggers:
+            cursor.execute(trigger)
@@ -0,0 +1,92 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_save)
+from django.dispatch import receiver
+
+from .cache import filmwork_cache
+from .constants import INVALIDATION_BATCH_SIZE
+from .db import use_primary
+from .models import Filmwork, Genre, GenreFilmwork, Person, PersonFilmwork
+
+
+# Only these fields of a genre or person end up in the cached aggregates.
+LABEL_FIELDS = {Genre: 'name', Person: 'full_name'}
+
+
+def invalidate_on_commit(film_work_ids):
+    film_work_ids = list(film_work_ids)
+    if film_work_ids:
+        transaction.on_commit(
+            partial(filmwork_cache.invalidate, film_work_ids)
+        )
+
+
+def invalidate_linked_films(through, field, instance):
+    with use_primary():
+        filmwork_cache.invalidate(
+            through.objects.filter(**{field: instance}).values_list(
+                'film_work_id', flat=True
+            ).iterator(chunk_size=INVALIDATION_BATCH_SIZE)
+        )
+
+
+@receiver(post_save, sender=Filmwork)
+@receiver(post_delete, sender=Filmwork)
+def invalidate_filmwork(sender, instance, **kwargs):
+    invalidate_on_commit([instance.pk])
+
+
+@receiver(post_save, sender=GenreFilmwork)
+@receiver(post_delete, sender=GenreFilmwork)
+@receiver(post_save, sender=PersonFilmwork)
+@receiver(post_delete, sender=PersonFilmwork)
+def invalidate_credit(sender, instance, **kwargs):
+    invalidate_on_commit([instance.film_work_id])
+
+
+@receiver(pre_save, sender=Genre)
+@receiver(pre_save, sender=Person)
+def remember_label(sender, instance, using, **kwargs):
+    if instance._state.adding:
+        return
+    instance._stored_label = sender._default_manager.using(using).filter(
+        pk=instance.pk
+    ).values_list(LABEL_FIELDS[sender], flat=True).first()
+
+
+@receiver(post_save, sender=Genre)
+def invalidate_genre_films(sender, instance, created, **kwargs):
+    if created or getattr(instance, '_stored_label', None) == instance.name:
+        return
+    transaction.on_commit(
+        partial(invalidate_linked_films, GenreFilmwork, 'genre', instance)
+    )
+
+
+@receiver(post_save, sender=Person)
+def invalidate_person_films(sender, instance, created, **kwargs):
+    if (
+        created
+        or getattr(instance, '_stored_label', None) == instance.full_name
+    ):
+        return
+    transaction.on_commit(
+        partial(invalidate_linked_films, PersonFilmwork, 'person', instance)
+    )
+
+
+@receiver(m2m_changed, sender=Filmwork.genres.through)
+@receiver(m2m_changed, sender=Filmwork.persons.through)
+def invalidate_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith('post_'):
+            invalidate_on_commit([instance.pk])
+    elif action in ('post_add', 'post_remove'):
+        invalidate_on_commit(pk_set)
+    elif action == 'pre_clear':
+        field = 'genre' if sender is GenreFilmwork else 'person'
+        invalidate_on_commit(sender.objects.filter(
+            **{field: instance}
+        ).values_list('film_work_id', flat=True))
@@ -0,0 +1,110 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .constants import TOP_PERSONS_COUNT
+from .db import use_primary
+from .models import CatalogStat
+
+CACHE_KEY = 'movies:catalog_stats'
+
+# Serializes folds and rebuilds; the value is arbitrary but must be unique
+# among the advisory locks taken against this database.
+FOLD_LOCK_ID = 7412001
+
+FACET_DIMENSIONS = (
+    CatalogStat.Dimension.type,
+    CatalogStat.Dimension.rating,
+    CatalogStat.Dimension.genre,
+)
+
+LOCK_SQL = 'SELECT pg_advisory_xact_lock(%s)'
+TRY_LOCK_SQL = 'SELECT pg_try_advisory_xact_lock(%s)'
+
+FOLD_SQL = """
+    WITH folded AS (
+        DELETE FROM content.catalog_stat_delta
+        RETURNING dimension, key, delta
+    )
+    INSERT INTO content.catalog_stat (dimension, key, value)
+    SELECT dimension, key, sum(delta) FROM folded
+    GROUP BY dimension, key
+    ORDER BY dimension, key
+    ON CONFLICT (dimension, key)
+    DO UPDATE SET value = content.catalog_stat.value + EXCLUDED.value
+    """
+
+REBUILD_SQL = (
+    'LOCK TABLE content.film_work, content.genre_film_work, '
+    'content.person_film_work IN SHARE MODE',
+    'DELETE FROM content.catalog_stat_delta',
+    'DELETE FROM content.catalog_stat',
+    """
+    INSERT INTO content.catalog_stat (dimension, key, value)
+    SELECT 'type', type, count(*) FROM content.film_work GROUP BY type
+    UNION ALL
+    SELECT 'rating', content.rating_bucket(rating), count(*)
+    FROM content.film_work GROUP BY 2
+    UNION ALL
+    SELECT 'genre', genre_id::text, count(*)
+    FROM content.genre_film_work GROUP BY genre_id
+    UNION ALL
+    SELECT 'person', person_id::text, count(*)
+    FROM content.person_film_work GROUP BY person_id
+    """,
+)
+
+
+def get_catalog_stats():
+    """Counters from content.catalog_stat, at most
+    CATALOG_STATS_CACHE_TIMEOUT seconds old.
+
+    A cache miss folds the pending deltas first unless another process is
+    already folding them.
+    """
+    stats = cache.get(CACHE_KEY)
+    if stats is not None:
+        return stats
+    with use_primary():
+        fold_catalog_stats(wait=False)
+        stats = {dimension: {} for dimension in CatalogStat.Dimension.values}
+        counters = CatalogStat.objects.filter(
+            dimension__in=FACET_DIMENSIONS, value__gt=0
+        ).values_list('dimension', 'key', 'value')
+        for dimension, key, value in counters:
+            stats[dimension][key] = value
+        top_persons = CatalogStat.objects.filter(
+            dimension=CatalogStat.Dimension.person, value__gt=0
+        ).order_by('-value').values_list('key', 'value')[:TOP_PERSONS_COUNT]
+        stats[CatalogStat.Dimension.person] = dict(top_persons)
+    stats['refreshed'] = timezone.now()
+    cache.set(CACHE_KEY, stats, settings.CATALOG_STATS_CACHE_TIMEOUT)
+    return stats
+
+
+@transaction.atomic
+def fold_catalog_stats(wait=True):
+    """Add the deltas appended by the triggers to the counters.
+
+    Triggers only insert into content.catalog_stat_delta, so concurrent
+    writers never wait on the shared counter rows. With wait=False the fold
+    is skipped, returning None, when another fold or rebuild holds the lock.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(LOCK_SQL if wait else TRY_LOCK_SQL, [FOLD_LOCK_ID])
+        if not wait and not cursor.fetchone()[0]:
+            return None
+        cursor.execute(FOLD_SQL)
+        folded = cursor.rowcount
+    transaction.on_commit(lambda: cache.delete(CACHE_KEY))
+    return folded
+
+
+@transaction.atomic
+def rebuild_catalog_stats():
+    with connection.cursor() as cursor:
+        cursor.execute(LOCK_SQL, [FOLD_LOCK_ID])
+        for statement in REBUILD_SQL:
+            cursor.execute(statement)
+    transaction.on_commit(lambda: cache.delete(CACHE_KEY))
@@ -0,0 +1,130 @@
+import argparse
+import os
+import random
+import time
+
+import psycopg
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+LOOKUPS = 200
+
+CREATE_TABLE = """
+CREATE TABLE bench.{name} (
+    id uuid NOT NULL,
+    film_work_id uuid NOT NULL,
+    person_id uuid NOT NULL,
+    role TEXT NOT NULL,
+    created timestamp with time zone,
+    PRIMARY KEY ({primary_key})
+) {partition_by}
+"""
+
+CREATE_INDEXES = (
+    'CREATE UNIQUE INDEX ON bench.{name} (film_work_id, person_id, role)',
+    'CREATE INDEX ON bench.{name} (person_id) INCLUDE (film_work_id, role)',
+)
+
+LOOKUP_QUERIES = {
+    'film_work_id': 'SELECT person_id, role FROM bench.{name} '
+                    'WHERE film_work_id = %s',
+    'person_id': 'SELECT film_work_id, role FROM bench.{name} '
+                 'WHERE person_id = %s',
+}
+
+
+def create_tables(cur, partitions):
+    cur.execute('DROP SCHEMA IF EXISTS bench CASCADE')
+    cur.execute('CREATE SCHEMA bench')
+    cur.execute(CREATE_TABLE.format(
+        name='plain', primary_key='id', partition_by=''
+    ))
+    cur.execute(CREATE_TABLE.format(
+        name='hashed',
+        primary_key='id, film_work_id',
+        partition_by='PARTITION BY HASH (film_work_id)',
+    ))
+    for remainder in range(partitions):
+        cur.execute(
+            f'CREATE TABLE bench.hashed_p{remainder} '
+            'PARTITION OF bench.hashed '
+            f'FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})'
+        )
+    for name in ('plain', 'hashed'):
+        for query in CREATE_INDEXES:
+            cur.execute(query.format(name=name))
+
+
+def load(conn, name, rows):
+    start = time.perf_counter()
+    with conn.cursor() as cur:
+        with cur.copy(
+            f'COPY bench.{name} '
+            '(id, film_work_id, person_id, role, created) FROM STDIN'
+        ) as copy:
+            for row in rows:
+                copy.write_row(row)
+        cur.execute(f'ANALYZE bench.{name}')
+    conn.commit()
+    return time.perf_counter() - start
+
+
+def lookup(conn, name, column, keys):
+    query = LOOKUP_QUERIES[column].format(name=name)
+    start = time.perf_counter()
+    with conn.cursor() as cur:
+        for key in keys:
+            cur.execute(query, [key])
+            cur.fetchall()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compare plain and hash-partitioned person_film_work.'
+    )
+    parser.add_argument('--partitions', type=int, default=8)
+    args = parser.parse_args()
+
+    dsn = {
+        'dbname': os.getenv('POSTGRES_DB'),
+        'user': os.getenv('POSTGRES_USER'),
+        'password': os.getenv('POSTGRES_PASSWORD'),
+        'host': os.getenv('POSTGRES_HOST'),
+        'port': os.getenv('POSTGRES_PORT'),
+        'options': os.getenv('POSTGRES_OPTION'),
+    }
+
+    with psycopg.connect(**dsn) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                'SELECT id, film_work_id, person_id, role, created '
+                'FROM content.person_film_work'
+            )
+            rows = cur.fetchall()
+            create_tables(cur, args.partitions)
+        conn.commit()
+
+        film_work_ids = random.sample(
+            [row[1] for row in rows], min(LOOKUPS, len(rows))
+        )
+        person_ids = random.sample(
+            [row[2] for row in rows], min(LOOKUPS, len(rows))
+        )
+
+        print(f'{len(rows)} rows, {args.partitions} partitions')
+        for name in ('plain', 'hashed'):
+            load_time = load(conn, name, rows)
+            film_time = lookup(conn, name, 'film_work_id', film_work_ids)
+            person_time = lookup(conn, name, 'person_id', person_ids)
+            print(
+                f'{name:8} load {load_time:8.2f} s  '
+                f'by film_work_id {film_time * 1000:8.2f} ms  '
+                f'by person_id {person_time * 1000:8.2f} ms'
+            )
+
+        with conn.cursor() as cur:
+            cur.execute('DROP SCHEMA bench CASCADE')
+        conn.commit()
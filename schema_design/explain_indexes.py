@@ -0,0 +1,228 @@
+import argparse
+import os
+
+import psycopg
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+GENRES_COUNT = 30
+
+NEW_INDEXES = (
+    'film_work_modified_idx',
+    'person_modified_idx',
+    'genre_modified_idx',
+    'person_film_work_person_idx',
+    'genre_film_work_film_work_idx',
+)
+
+NEW_CONSTRAINTS = (
+    ('genre_film_work', 'genre_film_work_idx'),
+    ('person_film_work', 'person_film_work_role_idx'),
+)
+
+# The index set Django created before the access-path migration: one index
+# per foreign key plus the non-unique composite link-table indexes.
+BASELINE_INDEXES = (
+    'CREATE INDEX baseline_gfw_film_work ON genre_film_work (film_work_id)',
+    'CREATE INDEX baseline_gfw_genre ON genre_film_work (genre_id)',
+    'CREATE INDEX baseline_gfw_film_work_genre '
+    'ON genre_film_work (film_work_id, genre_id)',
+    'CREATE INDEX baseline_pfw_film_work ON person_film_work (film_work_id)',
+    'CREATE INDEX baseline_pfw_person ON person_film_work (person_id)',
+    'CREATE INDEX baseline_pfw_film_work_person '
+    'ON person_film_work (film_work_id, person_id)',
+)
+
+SEED_QUERIES = (
+    """
+    INSERT INTO genre (id, name, description, created, modified)
+    SELECT gen_random_uuid(), 'Genre ' || n, '', now(), now()
+    FROM generate_series(1, %(genres)s) AS n
+    """,
+    """
+    INSERT INTO person (id, full_name, created, modified)
+    SELECT gen_random_uuid(), 'Person ' || n, now(),
+           now() - n * interval '1 second'
+    FROM generate_series(1, %(persons)s) AS n
+    """,
+    """
+    INSERT INTO film_work (
+        id, title, description, creation_date, rating, type,
+        created, modified
+    )
+    SELECT gen_random_uuid(), 'Film ' || n, '', current_date - n %% 10000,
+           round((random() * 100)::numeric, 1),
+           (ARRAY['drama', 'comedy'])[1 + n %% 2],
+           now(), now() - n * interval '1 second'
+    FROM generate_series(1, %(films)s) AS n
+    """,
+    """
+    INSERT INTO genre_film_work (id, film_work_id, genre_id, created)
+    SELECT gen_random_uuid(), f.id, g.id, now()
+    FROM film_work f
+    CROSS JOIN LATERAL (
+        SELECT id FROM genre ORDER BY md5(id::text || f.id::text) LIMIT 2
+    ) g
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    WITH p AS (SELECT array_agg(id) AS ids FROM person)
+    INSERT INTO person_film_work (id, film_work_id, person_id, role, created)
+    SELECT gen_random_uuid(), f.id,
+           p.ids[
+               1 + floor(power(random(), 3) * array_length(p.ids, 1))::int
+           ],
+           (ARRAY['actor', 'director', 'writer'])[
+               1 + floor(random() * 3)::int
+           ],
+           now()
+    FROM film_work f
+    CROSS JOIN p
+    CROSS JOIN generate_series(1, %(credits)s)
+    ON CONFLICT DO NOTHING
+    """,
+)
+
+PARAMS_QUERIES = {
+    'film_work_id': 'SELECT id FROM film_work ORDER BY random() LIMIT 1',
+    'person_id': """
+        SELECT person_id FROM person_film_work
+        GROUP BY person_id ORDER BY count(*) DESC LIMIT 1
+    """,
+    'genre_id': """
+        SELECT genre_id FROM genre_film_work
+        GROUP BY genre_id ORDER BY count(*) DESC LIMIT 1
+    """,
+    'modified': """
+        SELECT modified FROM film_work
+        ORDER BY modified OFFSET (SELECT count(*) / 2 FROM film_work) LIMIT 1
+    """,
+}
+
+BENCHMARK_QUERIES = {
+    'film inline: persons': """
+        SELECT pfw.id, pfw.person_id, pfw.role, p.full_name
+        FROM person_film_work pfw JOIN person p ON p.id = pfw.person_id
+        WHERE pfw.film_work_id = %(film_work_id)s ORDER BY pfw.id
+    """,
+    'film inline: genres': """
+        SELECT gfw.id, gfw.genre_id FROM genre_film_work gfw
+        WHERE gfw.film_work_id = %(film_work_id)s ORDER BY gfw.id
+    """,
+    'person inline: films': """
+        SELECT pfw.id, pfw.film_work_id, pfw.role, fw.title
+        FROM person_film_work pfw JOIN film_work fw ON fw.id = pfw.film_work_id
+        WHERE pfw.person_id = %(person_id)s ORDER BY pfw.id
+    """,
+    'genre: films': """
+        SELECT fw.id, fw.title
+        FROM genre_film_work gfw JOIN film_work fw ON fw.id = gfw.film_work_id
+        WHERE gfw.genre_id = %(genre_id)s ORDER BY fw.title LIMIT 100
+    """,
+    'sync: film_work by modified': """
+        SELECT id, modified FROM film_work
+        WHERE (modified, id) > (
+            %(modified)s, '00000000-0000-0000-0000-000000000000'
+        )
+        ORDER BY modified, id LIMIT 100
+    """,
+    'sync: person by modified': """
+        SELECT id, modified FROM person
+        WHERE modified > %(modified)s ORDER BY modified, id LIMIT 100
+    """,
+}
+
+
+def seed(cur, films, persons, credits):
+    for query in SEED_QUERIES:
+        cur.execute(
+            query,
+            {
+                'genres': GENRES_COUNT,
+                'films': films,
+                'persons': persons,
+                'credits': credits,
+            }
+        )
+    cur.execute('ANALYZE')
+
+
+def explain(cur, query, params):
+    # Warm-up run so both index sets are measured with a hot buffer cache.
+    cur.execute(query, params)
+    cur.fetchall()
+    cur.execute(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}', params)
+    plan = cur.fetchone()[0][0]
+    root = plan['Plan']
+    buffers = root.get('Shared Hit Blocks', 0) + root.get(
+        'Shared Read Blocks', 0
+    )
+    return plan['Execution Time'], buffers, root['Node Type']
+
+
+def run(conn):
+    with conn.cursor() as cur:
+        params = {}
+        for name, query in PARAMS_QUERIES.items():
+            cur.execute(query)
+            params[name] = cur.fetchone()[0]
+
+        with_indexes = {
+            name: explain(cur, query, params)
+            for name, query in BENCHMARK_QUERIES.items()
+        }
+        for table, constraint in NEW_CONSTRAINTS:
+            cur.execute(
+                f'ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {constraint}'
+            )
+            cur.execute(f'DROP INDEX IF EXISTS {constraint}')
+        for index in NEW_INDEXES:
+            cur.execute(f'DROP INDEX IF EXISTS {index}')
+        for statement in BASELINE_INDEXES:
+            cur.execute(statement)
+        without_indexes = {
+            name: explain(cur, query, params)
+            for name, query in BENCHMARK_QUERIES.items()
+        }
+    conn.rollback()
+
+    print(f'{"query":32} {"before ms":>10} {"after ms":>10} '
+          f'{"before buf":>10} {"after buf":>10}  plan before -> after')
+    for name in BENCHMARK_QUERIES:
+        before_ms, before_buf, before_node = without_indexes[name]
+        after_ms, after_buf, after_node = with_indexes[name]
+        print(f'{name:32} {before_ms:10.2f} {after_ms:10.2f} '
+              f'{before_buf:10} {after_buf:10}  '
+              f'{before_node} -> {after_node}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='EXPLAIN (ANALYZE, BUFFERS) admin, inline and sync '
+                    'queries with the access-path indexes and with the '
+                    'index set they replaced.'
+    )
+    parser.add_argument('--seed-films', type=int, default=0)
+    parser.add_argument('--seed-persons', type=int, default=100000)
+    parser.add_argument('--seed-credits', type=int, default=5)
+    args = parser.parse_args()
+
+    dsn = {
+        'dbname': os.getenv('POSTGRES_DB'),
+        'user': os.getenv('POSTGRES_USER'),
+        'password': os.getenv('POSTGRES_PASSWORD'),
+        'host': os.getenv('POSTGRES_HOST'),
+        'port': os.getenv('POSTGRES_PORT'),
+        'options': os.getenv('POSTGRES_OPTION'),
+    }
+
+    with psycopg.connect(**dsn, cursor_factory=psycopg.ClientCursor) as conn:
+        if args.seed_films:
+            with conn.cursor() as cur:
+                seed(
+                    cur, args.seed_films, args.seed_persons, args.seed_credits
+                )
+            conn.commit()
+        run(conn)
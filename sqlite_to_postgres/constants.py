@@ -8,3 +8,6 @@ FILM_WORK_FIELDS = (
     'rating, type, created_at, updated_at'
 )
 DATE_FORMAT = '%Y-%m-%d %H:%M:%S.%f+00'
+PLAN_SAMPLE_SIZE = 500
+PLAN_BATCH_BYTES = 1024 * 1024
+PLAN_MAX_BATCH_SIZE = 10000
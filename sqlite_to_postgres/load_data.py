@@ -1,6 +1,10 @@
+import argparse
 import os
+import random
 import sqlite3
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import closing, contextmanager
 from dataclasses import dataclass, astuple, fields
 from typing import Generator
@@ -15,7 +19,9 @@ from dotenv import load_dotenv
 
 from constants import (BATCH_SIZE, LOGGER_NAME,
                        LOGGER_CODE, LOGGER_FORMAT,
-                       FILM_WORK_FIELDS, DATE_FORMAT)
+                       FILM_WORK_FIELDS, DATE_FORMAT,
+                       PLAN_SAMPLE_SIZE, PLAN_BATCH_BYTES,
+                       PLAN_MAX_BATCH_SIZE)
 
 load_dotenv()
 
@@ -175,41 +181,252 @@ TABLE_CLASS = {
 }
 
 def extract_data(
-    sqlite_cursor: sqlite3.Cursor, table_name
+    sqlite_cursor: sqlite3.Cursor, table_name, shard=None,
+    batch_size=BATCH_SIZE
 ) -> Generator[list[sqlite3.Row], None, None]:
-    if table_name == 'film_work':
-        sqlite_cursor.execute(f'SELECT {FILM_WORK_FIELDS} FROM {table_name};')
+    columns = FILM_WORK_FIELDS if table_name == 'film_work' else '*'
+    if shard is None:
+        sqlite_cursor.execute(f'SELECT {columns} FROM {table_name};')
     else:
-        sqlite_cursor.execute(f'SELECT * FROM {table_name};')
-    while results := sqlite_cursor.fetchmany(BATCH_SIZE):
+        sqlite_cursor.execute(
+            f'SELECT {columns} FROM {table_name} '
+            'WHERE rowid BETWEEN ? AND ?;',
+            shard
+        )
+    while results := sqlite_cursor.fetchmany(batch_size):
         yield results
 
 
-def transform_data(sqlite_cursor: sqlite3.Cursor, table_name, model):
+def transform_data(
+    sqlite_cursor: sqlite3.Cursor, table_name, model, shard=None,
+    batch_size=BATCH_SIZE
+):
     try:
-        for batch in extract_data(sqlite_cursor, table_name):
+        for batch in extract_data(
+            sqlite_cursor, table_name, shard, batch_size
+        ):
             yield [model(**dict(row)) for row in batch]
     except sqlite3.Error as exception:
         logger.error(exception)
 
 
+def get_primary_key(pg_cursor: psycopg.Cursor, table_name):
+    pg_cursor.execute(
+        'SELECT a.attname FROM pg_index i '
+        'JOIN pg_attribute a '
+        'ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey) '
+        'WHERE i.indrelid = %s::regclass AND i.indisprimary',
+        [f'content.{table_name}']
+    )
+    return ', '.join(row['attname'] for row in pg_cursor.fetchall())
+
+
+def get_partitions(pg_cursor: psycopg.Cursor, table_name):
+    pg_cursor.execute(
+        'SELECT count(*) AS partitions FROM pg_inherits '
+        'WHERE inhparent = %s::regclass',
+        [f'content.{table_name}']
+    )
+    return pg_cursor.fetchone()['partitions']
+
+
+def insert_query(target, model, conflict_target):
+    columns = ", ".join(
+        field.name for field in fields(model)
+    ).replace(
+        'updated_at', 'modified'
+    ).replace(
+        'created_at', 'created'
+    )
+    values = ', '.join(['%s'] * len(fields(model)))
+    return f'INSERT INTO {target} ({columns}) VALUES ({values}) ON CONFLICT ({conflict_target}) DO NOTHING' # noqa
+
+
 def load_data(
-    sqlite_cursor: sqlite3.Cursor, pg_cursor: psycopg.Cursor, table_name, model
+    sqlite_cursor: sqlite3.Cursor, pg_cursor: psycopg.Cursor, table_name,
+    model, conflict_target='id', shard=None, batch_size=BATCH_SIZE
 ):
-    for batch in transform_data(sqlite_cursor, table_name, model):
-        columns = ", ".join(
-            field.name for field in fields(model)
-        ).replace(
-            'updated_at', 'modified'
-        ).replace(
-            'created_at', 'created'
-        )
-        values = ', '.join(['%s'] * len(fields(model)))
-        query = f'INSERT INTO content.{table_name} ({columns}) VALUES ({values}) ON CONFLICT (id) DO NOTHING' # noqa
+    query = insert_query(f'content.{table_name}', model, conflict_target)
+    for batch in transform_data(
+        sqlite_cursor, table_name, model, shard, batch_size
+    ):
         batch_as_tuples = [astuple(value) for value in batch]
         pg_cursor.executemany(query, batch_as_tuples)
 
 
+def get_rowid_ranges(sqlite_cursor: sqlite3.Cursor, table_name, workers):
+    sqlite_cursor.execute(f'SELECT min(rowid), max(rowid) FROM {table_name};')
+    first, last = sqlite_cursor.fetchone()
+    if first is None:
+        return []
+    step = (last - first) // workers + 1
+    return [
+        (start, min(start + step - 1, last))
+        for start in range(first, last + 1, step)
+    ]
+
+
+def load_data_parallel(
+    table_name, model, conflict_target, workers, batch_size=BATCH_SIZE
+):
+    with conn_context(db_path) as sqlite_conn:
+        with closing(sqlite_conn.cursor()) as sqlite_cur:
+            shards = get_rowid_ranges(sqlite_cur, table_name, workers)
+
+    def load_shard(shard):
+        with conn_context(
+            db_path
+        ) as sqlite_conn, closing(psycopg.connect(**dsl)) as pg_conn:
+            with closing(sqlite_conn.cursor()) as sqlite_cur, closing(
+                pg_conn.cursor()
+            ) as pg_cur:
+                load_data(
+                    sqlite_cur, pg_cur, table_name, model,
+                    conflict_target, shard, batch_size
+                )
+            pg_conn.commit()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(load_shard, shards))
+
+
+@dataclass
+class TablePlan:
+    table_name: str
+    rows: int
+    row_width: float
+    convert_seconds: float
+    insert_seconds: float
+    wal_bytes: float
+    disk_bytes: float
+    partitions: int
+
+    @property
+    def batch_size(self):
+        if not self.row_width:
+            return BATCH_SIZE
+        return max(
+            BATCH_SIZE,
+            min(PLAN_MAX_BATCH_SIZE, int(PLAN_BATCH_BYTES / self.row_width))
+        )
+
+    @property
+    def workers(self):
+        if not self.partitions:
+            return 1
+        return min(self.partitions, os.cpu_count() or 1)
+
+    @property
+    def duration(self):
+        return self.rows * (
+            self.convert_seconds + self.insert_seconds
+        ) / self.workers
+
+
+def sample_rows(sqlite_cursor: sqlite3.Cursor, table_name):
+    sqlite_cursor.execute(
+        f'SELECT count(*), min(rowid), max(rowid) FROM {table_name};'
+    )
+    rows, low, high = sqlite_cursor.fetchone()
+    if not rows:
+        return 0, []
+    rowids = random.sample(
+        range(low, high + 1), min(PLAN_SAMPLE_SIZE, high - low + 1)
+    )
+    columns = FILM_WORK_FIELDS if table_name == 'film_work' else '*'
+    placeholders = ', '.join('?' * len(rowids))
+    sqlite_cursor.execute(
+        f'SELECT {columns} FROM {table_name} '
+        f'WHERE rowid IN ({placeholders});',
+        rowids
+    )
+    return rows, sqlite_cursor.fetchall()
+
+
+def trial_insert(
+    pg_conn: psycopg.Connection, table_name, model, conflict_target, sample
+):
+    """Time, WAL and disk cost of inserting the sample into an empty copy.
+
+    WAL comes from EXPLAIN (ANALYZE, WAL) of the sample's own statements
+    (PostgreSQL 13+), so writes of other sessions are not counted.
+    """
+    scratch = f'plan_{table_name}'
+    rows = [astuple(value) for value in sample]
+    query = insert_query(scratch, model, conflict_target)
+    with closing(pg_conn.cursor()) as pg_cur:
+        pg_cur.execute(
+            f'CREATE TABLE {scratch} (LIKE content.{table_name} '
+            'INCLUDING DEFAULTS INCLUDING INDEXES)'
+        )
+        pg_cur.execute(f"SELECT pg_total_relation_size('{scratch}')")
+        empty_size = pg_cur.fetchone()[0]
+        pg_cur.execute('SAVEPOINT trial')
+        start = time.perf_counter()
+        pg_cur.executemany(query, rows)
+        elapsed = time.perf_counter() - start
+        pg_cur.execute(f"SELECT pg_total_relation_size('{scratch}')")
+        size = pg_cur.fetchone()[0]
+        pg_cur.execute('ROLLBACK TO SAVEPOINT trial')
+        wal = 0
+        for row in rows:
+            pg_cur.execute(f'EXPLAIN (ANALYZE, WAL, FORMAT JSON) {query}', row)
+            wal += pg_cur.fetchone()[0][0]['Plan'].get('WAL Bytes', 0)
+    pg_conn.rollback()
+    return elapsed, float(wal), size - empty_size
+
+
+def plan_table(
+    sqlite_cursor: sqlite3.Cursor, pg_conn: psycopg.Connection, table_name,
+    model
+):
+    rows, sample = sample_rows(sqlite_cursor, table_name)
+    if not sample:
+        return TablePlan(table_name, 0, 0, 0, 0, 0, 0, 0)
+    start = time.perf_counter()
+    converted = [model(**dict(row)) for row in sample]
+    convert_time = time.perf_counter() - start
+    width = sum(
+        len('\t'.join(map(str, astuple(value))).encode())
+        for value in converted
+    )
+    with closing(pg_conn.cursor(row_factory=dict_row)) as pg_cur:
+        conflict_target = get_primary_key(pg_cur, table_name)
+        partitions = get_partitions(pg_cur, table_name)
+    insert_time, wal, disk = trial_insert(
+        pg_conn, table_name, model, conflict_target, converted
+    )
+    count = len(converted)
+    return TablePlan(
+        table_name, rows, width / count, convert_time / count,
+        insert_time / count, wal / count, disk / count, partitions
+    )
+
+
+def print_plan(plans):
+    megabyte = 1024 * 1024
+    print(
+        f'{"table":18} {"rows":>10} {"width B":>8} {"batch":>6} '
+        f'{"workers":>7} {"time s":>9} {"WAL MB":>9} {"disk MB":>9}'
+    )
+    for plan in plans:
+        print(
+            f'{plan.table_name:18} {plan.rows:10} {plan.row_width:8.0f} '
+            f'{plan.batch_size:6} {plan.workers:7} {plan.duration:9.1f} '
+            f'{plan.rows * plan.wal_bytes / megabyte:9.1f} '
+            f'{plan.rows * plan.disk_bytes / megabyte:9.1f}'
+        )
+    print(
+        f'{"total":18} {sum(plan.rows for plan in plans):10} '
+        f'{"":8} {"":6} {"":7} '
+        f'{sum(plan.duration for plan in plans):9.1f} '
+        f'{sum(plan.rows * plan.wal_bytes for plan in plans) / megabyte:9.1f} '
+        f'{sum(plan.rows * plan.disk_bytes for plan in plans) / megabyte:9.1f}'
+    )
+    print('Triggers on content.* are not part of the trial insert.')
+    print('Foreign key checks are not measured: the trial table has no FKs.')
+
+
 def test_transfer(
     sqlite_cursor: sqlite3.Cursor, pg_cursor: psycopg.Cursor, table_name, model
 ):
@@ -241,6 +458,18 @@ def test_transfer(
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help='parallel loaders for partitioned tables'
+    )
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument(
+        '--plan', action='store_true',
+        help='estimate duration, WAL and disk usage without loading'
+    )
+    args = parser.parse_args()
+
     with conn_context(
         db_path
     ) as sqlite_conn, closing(psycopg.connect(**dsl)) as pg_conn:
@@ -251,15 +480,33 @@ if __name__ == '__main__':
             encoding=LOGGER_CODE,
             level=logging.DEBUG
         )
-        logger.info('Старт чтения из sqlite и запись в postgres')
         sqlite_conn.row_factory = sqlite3.Row
+        if args.plan:
+            logger.info('Оценка переноса из sqlite в postgres')
+            with closing(sqlite_conn.cursor()) as sqlite_cur:
+                print_plan([
+                    plan_table(sqlite_cur, pg_conn, table_name, model)
+                    for table_name, model in TABLE_CLASS.items()
+                ])
+            raise SystemExit
+        logger.info('Старт чтения из sqlite и запись в postgres')
         for table_name, model in TABLE_CLASS.items():
             with closing(
                 sqlite_conn.cursor()
             ) as sqlite_cur, closing(
                 pg_conn.cursor(row_factory=dict_row)
             ) as pg_cur:
-                load_data(sqlite_cur, pg_cur, table_name, model)
+                conflict_target = get_primary_key(pg_cur, table_name)
+                if args.workers > 1 and get_partitions(pg_cur, table_name):
+                    load_data_parallel(
+                        table_name, model, conflict_target, args.workers,
+                        args.batch_size
+                    )
+                else:
+                    load_data(
+                        sqlite_cur, pg_cur, table_name, model,
+                        conflict_target, batch_size=args.batch_size
+                    )
                 logger.info(f'Загрузка данных {table_name} выполнена!!!')
                 pg_conn.commit()
                 test_transfer(sqlite_cur, pg_cur, table_name, model)